@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+DAK Tooling Benchmark - Measures throughput and peak memory of each stage.
+For every (rows, dak-scale) point, generates a seeded synthetic workload with
+generate_dak_workload.py and runs the stages the DAK tools go through:
+reading recommendations, mapping them, building the Annex D traceability
+index, formatting issue bodies, planning edits and exporting Annex A. Each
+stage is timed on its own, then re-run under tracemalloc for peak memory, so
+the tracing overhead does not skew the timings. No GitHub API calls are made.
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+from create_dak_issues import DAK_FILE_ROLES, MAPPING, UPDATES_FILE, format_body, get_mapping_key
+from dak_traceability import ANNEX_A_FILE, build_index
+from export_dak_dictionary import export
+from generate_dak_workload import generate
+from plan_dak_edits import build_plan, workbook_sheet_order
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+RESULTS_FILE = "dak-benchmark.csv"
+RESULT_FIELDS = ["rows", "dak_scale", "stage", "items", "seconds", "items_per_sec", "peak_kib"]
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+# Each stage reads what earlier stages left in ctx, stores its own output and
+# returns the number of items it processed.
+
+def stage_read_recommendations(ctx):
+    df = pd.read_excel(os.path.join(ctx["dir"], UPDATES_FILE), sheet_name="Sheet1", dtype=str)
+    ctx["df"] = df.dropna(subset=["Recommendation Number"])
+    return len(ctx["df"])
+
+
+def stage_map_recommendations(ctx):
+    ctx["keys"] = [get_mapping_key(str(n)) for n in ctx["df"]["Recommendation Number"]]
+    return len(ctx["keys"])
+
+
+def stage_traceability_index(ctx):
+    ctx["trace"] = build_index(ctx["dir"])
+    return len(ctx["trace"]["requirements"])
+
+
+def stage_format_bodies(ctx):
+    count = 0
+    for (_, row), key in zip(ctx["df"].iterrows(), ctx["keys"]):
+        info = MAPPING.get(key, {"affected": []}) if key else {"affected": []}
+        format_body(
+            str(row.get("Recommendation Number", "")),
+            str(row.get("Recommendation Text", "")),
+            str(row.get("Recommendation Type", "")),
+            str(row.get("Topic Area", "")),
+            str(row.get("Rationale for change", "")),
+            row.get("Previous recommendations", ""),
+            info,
+            ctx["trace"],
+        )
+        count += 1
+    return count
+
+
+def stage_plan_edits(ctx):
+    # The number of edits only depends on the distinct MAPPING keys; reading
+    # the sheet order of the scaled workbooks is what grows with dak_scale.
+    keys = list(dict.fromkeys(k for k in ctx["keys"] if k))
+    sheet_order = {f: workbook_sheet_order(os.path.join(ctx["dir"], f)) for f in DAK_FILE_ROLES}
+    plan = build_plan(keys, sheet_order)
+    return sum(len(w["edits"]) for w in plan)
+
+
+def stage_export_dictionary(ctx):
+    stats = export(os.path.join(ctx["dir"], ANNEX_A_FILE), os.path.join(ctx["dir"], "export"))
+    return stats["elements"]
+
+
+STAGES = [
+    ("read_recommendations", stage_read_recommendations),
+    ("map_recommendations", stage_map_recommendations),
+    ("traceability_index", stage_traceability_index),
+    ("format_bodies", stage_format_bodies),
+    ("plan_edits", stage_plan_edits),
+    ("export_dictionary", stage_export_dictionary),
+]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def measure(stage, ctx, memory: bool):
+    start = time.perf_counter()
+    items = stage(ctx)
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        stage(ctx)
+        peak = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return items, seconds, peak
+
+
+def run_point(rows: int, dak_scale: int, seed: int, memory: bool, base_dir: str = "."):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="dak-bench-") as work:
+        generate(work, rows, dak_scale, seed, base_dir)
+        ctx = {"dir": work}
+        for name, stage in STAGES:
+            items, seconds, peak = measure(stage, ctx, memory)
+            results.append({
+                "rows": rows,
+                "dak_scale": dak_scale,
+                "stage": name,
+                "items": items,
+                "seconds": round(seconds, 4),
+                "items_per_sec": round(items / seconds, 1) if seconds else "",
+                "peak_kib": "" if peak is None else peak,
+            })
+            print(f"  {name:<22} {items:>8} items  {seconds:8.3f}s"
+                  + ("" if peak is None else f"  {peak:>8} KiB peak"))
+    return results
+
+
+def parse_sizes(text: str):
+    return [int(s) for s in text.split(",") if s.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated recommendation row counts")
+    parser.add_argument("--dak-scales", default="1",
+                        help="Comma-separated DAK workbook scale factors")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc pass (timings only)")
+    parser.add_argument("--out", default=RESULTS_FILE, help="CSV file for the results")
+    args = parser.parse_args()
+
+    sizes, scales = parse_sizes(args.sizes), parse_sizes(args.dak_scales)
+    if not sizes or not scales or min(sizes) < 1 or min(scales) < 1:
+        print("ERROR: --sizes and --dak-scales must be positive integers.", file=sys.stderr)
+        sys.exit(1)
+
+    results = []
+    for scale in scales:
+        for rows in sizes:
+            print(f"rows={rows} dak_scale={scale}")
+            results += run_point(rows, scale, args.seed, not args.no_memory)
+
+    with open(args.out, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nResults saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
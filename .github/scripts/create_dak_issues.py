@@ -13,6 +13,8 @@ import json
 import pandas as pd
 import requests
 
+from dak_traceability import ANNEX_D_FILE, load_index, requirements_for
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -603,7 +605,7 @@ def ensure_label(headers: dict, name: str, color: str, description: str = ""):
                       json={"name": name, "color": color, "description": description})
 
 
-def format_body(rec_num, rec_text, rec_type, topic, rationale, prev, info):
+def format_body(rec_num, rec_text, rec_type, topic, rationale, prev, info, trace=None):
     lines = ["## Summary\n"]
     lines += [
         f"**Recommendation ID:** `{rec_num.strip()}`  ",
@@ -627,6 +629,16 @@ def format_body(rec_num, rec_text, rec_type, topic, rationale, prev, info):
         for j, c in enumerate(item["changes"], 1):
             lines.append(f"{j}. {c}")
         lines.append("")
+    reqs = requirements_for(info, trace)
+    if reqs:
+        lines += [
+            "## Affected Functional Requirements\n",
+            f"Review these Annex D requirements (`{ANNEX_D_FILE}`) for impact:\n",
+        ]
+        for req_id in reqs:
+            req = trace["requirements"][req_id]
+            lines.append(f"- `{req_id}` ({req['activity_text']}) — {req['want']}")
+        lines.append("")
     lines += ["## Implementation Instructions\n",
               "Implement all changes listed above in the respective DAK Excel files:\n"]
     for item in info.get("affected", []):
@@ -690,6 +702,13 @@ def main():
     ensure_label(headers, "data-dictionary", "e4e669", "Annex A Data Dictionary update")
     ensure_label(headers, "decision-logic", "d93f0b", "Annex B Decision Logic update")
     ensure_label(headers, "indicators", "0e8a16", "Annex C Indicators update")
+    ensure_label(headers, "functional-requirements", "5319e7",
+                 "Annex D Functional Requirements impact")
+
+    # Annex D traceability index; cached between runs, rebuilt when an annex changes
+    trace = load_index()
+    if trace is None:
+        print("  WARNING: Annex A, B or D workbook missing; skipping Annex D traceability")
 
     results = []
     for _, row in df.iterrows():
@@ -713,10 +732,12 @@ def main():
             labels.append("decision-logic")
         if any("29" in f for f in files):
             labels.append("indicators")
+        if requirements_for(info, trace):
+            labels.append("functional-requirements")
 
         short = rec_text[:65] + "..." if len(rec_text) > 65 else rec_text
         title = f"[DAK Update] {rec_type} - {topic}: {short}"
-        body  = format_body(rec_num, rec_text, rec_type, topic, rationale, prev, info)
+        body  = format_body(rec_num, rec_text, rec_type, topic, rationale, prev, info, trace)
 
         print(f"Creating issue for: {rec_num}")
         result = create_issue(headers, title, body, labels, ["copilot"])
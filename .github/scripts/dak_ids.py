@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+DAK IDs - Regular expressions for the IDs used across the DAK workbooks.
+Shared by the edit planner and the traceability index so both recognise the
+same activity, data element, decision, schedule and indicator IDs. IDs often
+end a sentence in MAPPING changes ("Remove rule HIV.D21.1.DT.03."), so a
+trailing full stop is not treated as part of the ID.
+"""
+
+import re
+
+# An ID ends at anything other than a word character or a full stop that
+# continues it (HIV.S.1 is not HIV.S.1.2, but is the ID in "... HIV.S.1.").
+ID_END = r"(?!\w|\.\w)"
+
+ACTIVITY_RE = re.compile(r"(?<![\w.])HIV\.[A-Z](?:-[A-Z])?\d+(?:\.\d+)*")
+ELEMENT_ID_RE = re.compile(r"(?<![\w.])HIV\.[A-Za-z]+\.DE\d+" + ID_END)
+# Decision table IDs, also found as the prefix of a rule ID (HIV.C7.DT.01).
+DECISION_ID_RE = re.compile(r"(?<![\w.])HIV\.[A-Z]\d+(?:\.\d+)?\.DT(?=(?:\.\d+)?" + ID_END + ")")
+SCHEDULE_ID_RE = re.compile(r"(?<![\w.])HIV\.S\.\d+" + ID_END)
+
+# Any of the above (rules kept whole) or an indicator ID, e.g. HIV.B.DE12,
+# HIV.D21.1.DT, HIV.C7.DT.01, HIV.S.1, HIV.IND.4.
+DAK_ID_RE = re.compile(
+    r"(?<![\w.])HIV\.(?:[A-Za-z]+\.DE\d+|[A-Z]\d+(?:\.\d+)?\.DT(?:\.\d+)?|S\.\d+|IND\.\d+)"
+    + ID_END
+)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+DAK Model - Compact in-memory model of parsed DAK workbooks.
+Every distinct cell value across all loaded workbooks (the four annexes and
+any historical versions) is stored once in a shared pool. Sheets keep one
+array of pool indices per column, so a repeated option, data type or linkage
+ID costs two or four bytes per occurrence instead of a Python object per cell.
+Rows are only turned into objects on access, through lightweight views.
+"""
+
+import os
+import gc
+import sys
+import glob
+import argparse
+import tracemalloc
+from array import array
+
+import openpyxl
+import pandas as pd
+
+from create_dak_issues import DAK_FILE_ROLES
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+HISTORY_GLOB = "Copilot/initial/*.xlsx"
+
+# Column arrays are built as unsigned ints (at least 4 bytes) and narrowed to
+# unsigned shorts when every pool index so far fits in 2 bytes.
+INDEX_TYPECODE = "I"
+NARROW_TYPECODE = "H"
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+class ValuePool:
+    """Distinct cell values; index 0 is reserved for empty cells."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self):
+        self.values = [None]
+        self._index = {}
+
+    def intern(self, value):
+        if value is None or value == "":
+            return 0
+        # Strings key on themselves; other types also key on their type so
+        # 1, 1.0 and True stay distinct.
+        key = value if type(value) is str else (type(value), value)
+        i = self._index.get(key)
+        if i is None:
+            i = len(self.values)
+            self.values.append(value)
+            self._index[key] = i
+        return i
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __len__(self):
+        return len(self.values) - 1
+
+
+class SheetTable:
+    """A sheet as column arrays of pool indices; row and column are 0-based."""
+
+    __slots__ = ("name", "pool", "columns", "n_rows")
+
+    def __init__(self, name: str, pool: ValuePool, rows):
+        self.name = name
+        self.pool = pool
+        self.columns = []
+        self.n_rows = 0
+        last = -1
+        for r, values in enumerate(rows):
+            while len(self.columns) < len(values):
+                self.columns.append(array(INDEX_TYPECODE, [0]) * r)
+            blank = True
+            for c, column in enumerate(self.columns):
+                i = pool.intern(values[c]) if c < len(values) else 0
+                column.append(i)
+                blank = blank and i == 0
+            if not blank:
+                last = r
+        # Drop trailing empty rows and columns left by formatting beyond the data.
+        self.n_rows = last + 1
+        for column in self.columns:
+            del column[self.n_rows:]
+        while self.columns and not any(self.columns[-1]):
+            self.columns.pop()
+        # Copying also drops the spare capacity left by append().
+        typecode = NARROW_TYPECODE if len(pool.values) <= 0xFFFF else INDEX_TYPECODE
+        self.columns = [array(typecode, column) for column in self.columns]
+
+    def __len__(self):
+        return self.n_rows
+
+    def value(self, row: int, col: int):
+        if not 0 <= row < self.n_rows:
+            raise IndexError(f"{self.name}: row {row} out of range")
+        if col >= len(self.columns):
+            return None
+        return self.pool.values[self.columns[col][row]]
+
+    def row(self, row: int, fields: dict = None):
+        if not 0 <= row < self.n_rows:
+            raise IndexError(f"{self.name}: row {row} out of range")
+        return RowView(self, row, fields)
+
+    def column(self, col: int):
+        values = self.pool.values
+        return (values[i] for i in self.columns[col]) if col < len(self.columns) else iter(())
+
+    def records(self, header_row: int = 0):
+        """Yield a view per row below header_row, addressable by header name."""
+        fields = {}
+        for c in range(len(self.columns)):
+            name = self.value(header_row, c)
+            if name is not None:
+                fields.setdefault(str(name).strip(), c)
+        for r in range(header_row + 1, self.n_rows):
+            yield RowView(self, r, fields)
+
+
+class RowView:
+    """Lazy view of one row; values are looked up in the pool on access."""
+
+    __slots__ = ("table", "index", "fields")
+
+    def __init__(self, table: SheetTable, index: int, fields: dict = None):
+        self.table = table
+        self.index = index
+        self.fields = fields or {}
+
+    def __getitem__(self, key):
+        col = key if isinstance(key, int) else self.fields[key]
+        return self.table.value(self.index, col)
+
+    def get(self, key, default=None):
+        if not isinstance(key, int) and key not in self.fields:
+            return default
+        value = self[key]
+        return default if value is None else value
+
+    def values(self):
+        return [self.table.value(self.index, c) for c in range(len(self.table.columns))]
+
+    def as_dict(self):
+        return {name: self.table.value(self.index, c) for name, c in self.fields.items()}
+
+
+class DakStore:
+    """Loaded workbooks, keyed by label, all sharing one value pool."""
+
+    def __init__(self):
+        self.pool = ValuePool()
+        self.workbooks = {}
+
+    def load(self, path: str, label: str = None, sheets: list = None):
+        label = label or path
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            tables = {}
+            for sheet in sheets or wb.sheetnames:
+                tables[sheet] = SheetTable(sheet, self.pool, wb[sheet].iter_rows(values_only=True))
+        finally:
+            wb.close()
+        self.workbooks[label] = tables
+        return tables
+
+    def sheet(self, label: str, name: str):
+        return self.workbooks[label][name]
+
+    def stats(self):
+        tables = [t for tables in self.workbooks.values() for t in tables.values()]
+        return {
+            "workbooks": len(self.workbooks),
+            "sheets": len(tables),
+            "cells": sum(len(t.columns) * t.n_rows for t in tables),
+            "pooled_values": len(self.pool),
+            "index_bytes": sum(c.itemsize * len(c) for t in tables for c in t.columns),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def workbook_paths(include_history: bool):
+    paths = [f for f in DAK_FILE_ROLES if os.path.exists(f)]
+    if include_history:
+        paths += sorted(glob.glob(HISTORY_GLOB))
+    return paths
+
+
+def traced_peak(load):
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current // 1024, peak // 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--no-history", action="store_true",
+                        help=f"Only load the current annexes, not {HISTORY_GLOB}")
+    parser.add_argument("--compare", action="store_true",
+                        help="Also load the same workbooks into pandas DataFrames and compare")
+    args = parser.parse_args()
+
+    paths = workbook_paths(not args.no_history)
+    if not paths:
+        print("ERROR: no DAK workbooks found.", file=sys.stderr)
+        sys.exit(1)
+
+    def load_store():
+        store = DakStore()
+        for path in paths:
+            store.load(path)
+        return store
+
+    store, current, peak = traced_peak(load_store)
+    stats = store.stats()
+    print(f"Loaded {stats['workbooks']} workbooks, {stats['sheets']} sheets, "
+          f"{stats['cells']} cells, {stats['pooled_values']} distinct values")
+    print(f"DakStore: {current} KiB retained ({peak} KiB peak while loading)")
+
+    if args.compare:
+        def load_frames():
+            return [pd.read_excel(p, sheet_name=None, header=None, dtype=object) for p in paths]
+
+        _, current, peak = traced_peak(load_frames)
+        print(f"pandas:   {current} KiB retained ({peak} KiB peak while loading)")
+
+
+if __name__ == "__main__":
+    main()
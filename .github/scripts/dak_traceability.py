@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+DAK Traceability Index - Links Annex D functional requirements to the Annex A
+data elements, Annex B decision tables and Annex B schedules they depend on.
+Requirements are matched by the activity IDs they list (and any DAK IDs in
+their text); schedules, which carry no activity ID, are matched on terms
+shared between their titles and the requirement's activity descriptions.
+The index is built once and cached as JSON next to the workbooks, keyed by a
+hash of each source file, so lookups per recommendation are plain dictionary
+reads.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+
+import openpyxl
+
+from dak_ids import ACTIVITY_RE, DECISION_ID_RE, ELEMENT_ID_RE, SCHEDULE_ID_RE
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+ANNEX_A_FILE = "WHO-UCN-HHS-SIA-2023.27-eng.xlsx"
+ANNEX_B_FILE = "WHO-UCN-HHS-SIA-2023.28-eng.xlsx"
+ANNEX_D_FILE = "WHO-UCN-HHS-SIA-2023.30-eng.xlsx"
+INDEX_FILE = "dak-traceability-index.json"
+CHOICE_COLUMN = "Multiple Choice Type (if applicable)"
+OPTION_TYPE = "Input Option"
+# Bump when the matching rules change so cached indexes are rebuilt.
+INDEX_VERSION = 3
+
+QUOTED_RE = re.compile(r"'([^']+)'")
+WORD_RE = re.compile(r"[a-z][a-z0-9-]{2,}")
+
+# Words too common across the DAK activity and schedule titles to say
+# anything about which schedule a requirement depends on.
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "into", "are", "was", "can",
+    "able", "have", "has", "all", "any", "other", "their", "them", "they", "who", "when",
+    "which", "been", "being", "not", "also", "should", "would", "will", "need", "needs",
+    "system", "client", "clients", "health", "worker", "user", "users", "record",
+    "records", "data", "hiv", "determine", "provide", "service", "services", "visit",
+    "people", "person", "ensure", "information", "want", "time", "schedule",
+}
+# Terms that recur across unrelated activities and schedules; a schedule
+# sharing only one of these with a requirement is not linked to it.
+GENERIC_TERMS = {"art", "test", "recommended"}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def clean(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def stem(word: str):
+    """Strip a plural "s", then "ing", so "screenings" and "screening" agree."""
+    if word.endswith("s") and not word.endswith("ss") and len(word) >= 5:
+        word = word[:-1]
+    if word.endswith("ing") and len(word) >= 7:
+        word = word[:-3]
+    return word
+
+
+def terms_match(a: set, b: set):
+    shared = a & b
+    return len(shared) >= 2 or bool(shared - GENERIC_TERMS)
+
+
+def terms(text: str):
+    return {stem(w) for w in WORD_RE.findall(text.lower()) if w not in STOPWORDS}
+
+
+def file_hash(path: str):
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def covers(requirement_activity: str, activity: str):
+    """HIV.A6 covers HIV.A6 and its sub-activities such as HIV.A6.3."""
+    return activity == requirement_activity or activity.startswith(requirement_activity + ".")
+
+
+def sheet_rows(wb, sheet: str):
+    for values in wb[sheet].iter_rows(values_only=True):
+        yield [clean(v) for v in values]
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+def read_requirements(path: str):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        requirements = {}
+        header = None
+        for row in sheet_rows(wb, "Functional"):
+            if header is None:
+                header = row
+                continue
+            rec = dict(zip(header, row))
+            req_id = rec.get("Requirement ID", "")
+            if not req_id.startswith("HIV.FXNREQ"):
+                continue  # process section headings
+            activity_text = rec.get("Activity ID and Description", "")
+            text = " ".join(rec.get(h, "") for h in ("As a…", "I want…", "So that…"))
+            requirements[req_id] = {
+                "activities": list(dict.fromkeys(ACTIVITY_RE.findall(activity_text))),
+                "activity_text": activity_text,
+                "want": rec.get("I want…", ""),
+                "text": text,
+            }
+        return requirements
+    finally:
+        wb.close()
+
+
+def read_elements(path: str):
+    """Return ({activity: [element IDs]}, {label (lower-case): [element IDs]})."""
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        by_activity, by_label = {}, {}
+        for sheet in wb.sheetnames:
+            if not sheet.startswith("HIV."):
+                continue
+            header = None
+            for row in sheet_rows(wb, sheet):
+                if header is None:
+                    header = row
+                    continue
+                rec = dict(zip(header, row))
+                de_id = rec.get("Data Element ID", "")
+                # Option values ("Negative", "Other") are not element labels.
+                if not de_id or rec.get(CHOICE_COLUMN) == OPTION_TYPE:
+                    continue
+                m = ACTIVITY_RE.match(rec.get("Activity ID", ""))
+                if m:
+                    by_activity.setdefault(m.group(0), []).append(de_id)
+                label = rec.get("Data Element Label", "").lower()
+                if label:
+                    by_label.setdefault(label, []).append(de_id)
+        return by_activity, by_label
+    finally:
+        wb.close()
+
+
+def read_decisions_and_schedules(path: str):
+    """
+    Return ({decision ID: [trigger activities]}, {schedule ID: schedule title}).
+    Both are read from the ID / Trigger header rows at the top of each sheet.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        decisions, schedules = {}, {}
+        for sheet in wb.sheetnames:
+            if not sheet.startswith("HIV."):
+                continue  # skips COVER, README and Example Decision Tables
+            decision_id = None
+            for i, row in enumerate(sheet_rows(wb, sheet)):
+                cells = [c for c in row if c]
+                if len(cells) >= 2 and cells[0] == "Decision ID":
+                    decision_id = cells[1] if DECISION_ID_RE.fullmatch(cells[1]) else None
+                    if decision_id:
+                        decisions.setdefault(decision_id, [])
+                elif len(cells) >= 2 and cells[0] == "Trigger" and decision_id:
+                    decisions[decision_id] += ACTIVITY_RE.findall(cells[1])
+                elif len(cells) >= 2 and cells[0] == "Schedule ID":
+                    m = SCHEDULE_ID_RE.search(cells[1])
+                    if m:
+                        schedules[m.group(0)] = f"{sheet} {cells[1]}"
+                if i > 10:
+                    break  # header rows done; rule and service rows are not needed
+        return decisions, schedules
+    finally:
+        wb.close()
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def build_index(base_dir: str = "."):
+    requirements = read_requirements(os.path.join(base_dir, ANNEX_D_FILE))
+    elements_by_activity, elements_by_label = read_elements(os.path.join(base_dir, ANNEX_A_FILE))
+    decisions, schedules = read_decisions_and_schedules(os.path.join(base_dir, ANNEX_B_FILE))
+    schedule_terms = {s: terms(title) for s, title in schedules.items()}
+
+    by_element, by_decision, by_schedule = {}, {}, {}
+    for req_id, req in requirements.items():
+        text = f"{req['activity_text']} {req['text']}"
+        elements = set(ELEMENT_ID_RE.findall(text))
+        linked_decisions = set(DECISION_ID_RE.findall(text))
+        linked_schedules = set(SCHEDULE_ID_RE.findall(text))
+
+        for activity in req["activities"]:
+            for element_activity, ids in elements_by_activity.items():
+                if covers(activity, element_activity):
+                    elements.update(ids)
+            for decision_id, triggers in decisions.items():
+                if any(covers(activity, t) for t in triggers):
+                    linked_decisions.add(decision_id)
+
+        # Schedules carry no activity ID; match their titles against the
+        # activity descriptions the requirement lists.
+        activity_terms = terms(req["activity_text"])
+        for schedule_id, s_terms in schedule_terms.items():
+            if terms_match(activity_terms, s_terms):
+                linked_schedules.add(schedule_id)
+
+        req["elements"] = sorted(elements)
+        req["decisions"] = sorted(linked_decisions)
+        req["schedules"] = sorted(linked_schedules)
+        for target, ids in ((by_element, elements), (by_decision, linked_decisions),
+                            (by_schedule, linked_schedules)):
+            for i in ids:
+                target.setdefault(i, []).append(req_id)
+
+    return {
+        "requirements": requirements,
+        "by_element": by_element,
+        "by_decision": by_decision,
+        "by_schedule": by_schedule,
+        "labels": elements_by_label,
+    }
+
+
+def source_hashes(base_dir: str = "."):
+    return {f: file_hash(os.path.join(base_dir, f))
+            for f in (ANNEX_A_FILE, ANNEX_B_FILE, ANNEX_D_FILE)}
+
+
+def load_index(base_dir: str = ".", cache_path: str = None):
+    """
+    Return the traceability index, rebuilding it only when one of the source
+    workbooks changed since the cached copy was written (by default INDEX_FILE
+    in base_dir). Returns None when an annex is missing.
+    """
+    cache_path = cache_path or os.path.join(base_dir, INDEX_FILE)
+    if not all(os.path.exists(os.path.join(base_dir, f))
+               for f in (ANNEX_A_FILE, ANNEX_B_FILE, ANNEX_D_FILE)):
+        return None
+    hashes = source_hashes(base_dir)
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if cached.get("version") == INDEX_VERSION and cached.get("sources") == hashes:
+            return cached
+
+    index = build_index(base_dir)
+    index["version"] = INDEX_VERSION
+    index["sources"] = hashes
+    with open(cache_path, "w", encoding="utf-8") as fh:
+        json.dump(index, fh, indent=1, sort_keys=True)
+    return index
+
+
+def requirements_for(info: dict, index: dict):
+    """Annex D requirement IDs affected by a MAPPING entry, in ID order."""
+    if not index:
+        return []
+    found = set()
+    for item in info.get("affected", []):
+        text = " ".join(item["sheets"] + item["changes"])
+        for decision_id in DECISION_ID_RE.findall(text):
+            found.update(index["by_decision"].get(decision_id, []))
+        for schedule_id in SCHEDULE_ID_RE.findall(text):
+            found.update(index["by_schedule"].get(schedule_id, []))
+        element_ids = set(ELEMENT_ID_RE.findall(text))
+        for label in QUOTED_RE.findall(" ".join(item["changes"])):
+            element_ids.update(index["labels"].get(label.strip().lower(), []))
+        for element_id in element_ids:
+            found.update(index["by_element"].get(element_id, []))
+    return sorted(found)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    index = load_index()
+    if index is None:
+        print("ERROR: Annex A, B or D workbook not found.", file=sys.stderr)
+        sys.exit(1)
+    for req_id, req in index["requirements"].items():
+        print(f"{req_id}: {len(req['elements'])} elements, "
+              f"decisions {', '.join(req['decisions']) or '-'}, "
+              f"schedules {', '.join(req['schedules']) or '-'}")
+    print(f"\nIndex saved to {INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+DAK Dictionary Exporter - Streams Annex A data elements to FHIR and CSV.
+Reads each HIV.* sheet of the data dictionary row by row (openpyxl read-only
+mode), groups input options into ValueSets on the fly and writes logical
+models, ValueSets and a flat CSV incrementally, so memory use does not grow
+with the number of rows. --changed-only re-exports only the elements whose
+content changed since the last run, tracked in an export manifest; models of
+sheets that lost elements are rewritten and stale ValueSets are deleted.
+"""
+
+import os
+import sys
+import csv
+import json
+import hashlib
+import argparse
+
+import openpyxl
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+ANNEX_A_FILE = "WHO-UCN-HHS-SIA-2023.27-eng.xlsx"
+EXPORT_DIR = "dak-export"
+CSV_FILE = "data-dictionary.csv"
+CHANGED_CSV_FILE = "data-dictionary-changed.csv"
+MANIFEST_FILE = "export-manifest.json"
+
+FHIR_CANONICAL = "http://smart.who.int/hiv"
+CODE_SYSTEM = f"{FHIR_CANONICAL}/CodeSystem/HIVConcepts"
+
+CHOICE_COLUMN = "Multiple Choice Type (if applicable)"
+SELECT_TYPES = ("Select one", "Select all that apply")
+OPTION_TYPE = "Input Option"
+
+FHIR_TYPES = {
+    "Coding": "CodeableConcept",
+    "Codes": "Coding",
+    "Boolean": "boolean",
+    "Date": "date",
+    "DateTime": "dateTime",
+    "String": "string",
+    "Quantity": "Quantity",
+    "ID": "Identifier",
+}
+
+
+# ---------------------------------------------------------------------------
+# Streaming readers
+# ---------------------------------------------------------------------------
+
+def dictionary_sheets(wb):
+    # HIV.A Registration through HIV.Configuration; skips COVER, README and
+    # the 'all' / 'SEARCH' sheets, which repeat the per-activity content.
+    return [name for name in wb.sheetnames if name.startswith("HIV.")]
+
+
+def clean(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def iter_rows(path: str, sheets: list = None):
+    """
+    Yield (sheet, row dict) for every data element row, one row at a time.
+    Rows without a Data Element ID (HIV.Surveillance only references elements
+    defined on other sheets) are skipped.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        for sheet in sheets or dictionary_sheets(wb):
+            header = None
+            for values in wb[sheet].iter_rows(values_only=True):
+                if header is None:
+                    header = [clean(v) for v in values]
+                    continue
+                row = {h: clean(v) for h, v in zip(header, values) if h}
+                if row.get("Data Element ID"):
+                    yield sheet, row
+    finally:
+        wb.close()
+
+
+def iter_elements(rows):
+    """
+    Group option rows under the select element they belong to. Only the
+    element currently being assembled is held in memory.
+    """
+    current = None
+    for sheet, row in rows:
+        if row.get(CHOICE_COLUMN) == OPTION_TYPE and current is not None \
+                and current["sheet"] == sheet \
+                and current["row"].get(CHOICE_COLUMN) in SELECT_TYPES:
+            current["options"].append(row)
+            continue
+        if current is not None:
+            yield current
+        current = {"sheet": sheet, "row": row, "options": []}
+    if current is not None:
+        yield current
+
+
+def element_hash(element: dict):
+    payload = json.dumps([element["row"], element["options"]], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# FHIR builders
+# ---------------------------------------------------------------------------
+
+def model_name(sheet: str):
+    return "".join(ch for ch in sheet if ch.isalnum())
+
+
+def sheet_code(sheet: str):
+    # Sheet names share prefixes ("HIV.D Care-Treatment", "HIV.D HIV-TB"), so
+    # the whole name is kept as the FHIR id.
+    return "-".join(sheet.split())
+
+
+def valueset_resource(element: dict):
+    row = element["row"]
+    vs_id = row["Data Element ID"]
+    return {
+        "resourceType": "ValueSet",
+        "id": vs_id,
+        "url": f"{FHIR_CANONICAL}/ValueSet/{vs_id}",
+        "name": model_name(row["Data Element Label"]) or vs_id.replace(".", ""),
+        "title": row["Data Element Label"],
+        "status": "draft",
+        "description": row.get("Description and Definition", ""),
+        "compose": {
+            "include": [{
+                "system": CODE_SYSTEM,
+                "concept": [
+                    {"code": o["Data Element ID"], "display": o["Data Element Label"]}
+                    for o in element["options"]
+                ],
+            }]
+        },
+    }
+
+
+def model_header(sheet: str):
+    name = model_name(sheet)
+    return {
+        "resourceType": "StructureDefinition",
+        "id": sheet_code(sheet),
+        "url": f"{FHIR_CANONICAL}/StructureDefinition/{sheet_code(sheet)}",
+        "name": name,
+        "title": sheet,
+        "status": "draft",
+        "kind": "logical",
+        "abstract": False,
+        "type": f"{FHIR_CANONICAL}/StructureDefinition/{sheet_code(sheet)}",
+        "baseDefinition": "http://hl7.org/fhir/StructureDefinition/Base",
+        "derivation": "specialization",
+    }
+
+
+def model_root(sheet: str):
+    name = model_name(sheet)
+    return {"id": name, "path": name, "short": sheet, "definition": sheet, "min": 0, "max": "*"}
+
+
+def model_element(element: dict):
+    row = element["row"]
+    sheet = element["sheet"]
+    data_type = row.get("Data Type", "")
+    result = {
+        "id": f"{model_name(sheet)}.{row['Data Element ID'].split('.')[-1]}",
+        "path": f"{model_name(sheet)}.{row['Data Element ID'].split('.')[-1]}",
+        "short": row.get("Data Element Label", ""),
+        "definition": row.get("Description and Definition") or row.get("Data Element Label", ""),
+        "min": 1 if row.get("Required") == "R" else 0,
+        "max": "*" if row.get(CHOICE_COLUMN) == "Select all that apply" else "1",
+        "type": [{"code": FHIR_TYPES.get(data_type, "string")}],
+        "code": [{
+            "system": CODE_SYSTEM,
+            "code": row["Data Element ID"],
+            "display": row.get("Data Element Label", ""),
+        }],
+    }
+    if element["options"]:
+        result["binding"] = {
+            "strength": "required",
+            "valueSet": f"{FHIR_CANONICAL}/ValueSet/{row['Data Element ID']}",
+        }
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Incremental writers
+# ---------------------------------------------------------------------------
+
+def model_path(out_dir: str, sheet: str):
+    return os.path.join(out_dir, f"StructureDefinition-{sheet_code(sheet)}.json")
+
+
+def open_model(out_dir: str, sheet: str):
+    """Start a logical model file; elements are appended as they stream in."""
+    path = model_path(out_dir, sheet)
+    fh = open(path + ".tmp", "w", encoding="utf-8")
+    header = json.dumps(model_header(sheet), indent=2)
+    fh.write(header[:-2] + ',\n  "differential": {\n    "element": [\n')
+    fh.write("      " + json.dumps(model_root(sheet)))
+    return {"sheet": sheet, "path": path, "fh": fh, "ids": set(), "changed": False}
+
+
+def write_model_element(model: dict, element: dict):
+    model["fh"].write(",\n      " + json.dumps(model_element(element)))
+    model["ids"].add(element["row"]["Data Element ID"])
+
+
+def close_model(model: dict, keep: bool):
+    model["fh"].write("\n    ]\n  }\n}\n")
+    model["fh"].close()
+    if keep:
+        os.replace(model["path"] + ".tmp", model["path"])
+    else:
+        os.remove(model["path"] + ".tmp")
+
+
+def valueset_path(out_dir: str, element_id: str):
+    return os.path.join(out_dir, f"ValueSet-{element_id}.json")
+
+
+def write_valueset(out_dir: str, element: dict):
+    with open(valueset_path(out_dir, element["row"]["Data Element ID"]), "w", encoding="utf-8") as fh:
+        json.dump(valueset_resource(element), fh, indent=2)
+
+
+def remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def load_manifest(path: str):
+    """{element ID: {"sheet", "hash", "valueset"}} from the last run."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    # Manifests that only stored hashes cannot tell which sheet an element
+    # was on; treat them as missing so everything is exported again.
+    if not all(isinstance(v, dict) for v in manifest.values()):
+        return {}
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def export(source: str, out_dir: str, changed_only: bool = False):
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    # Read in both modes, so files left over from the last run can be removed.
+    previous = load_manifest(manifest_path)
+    previous_sheets = {}
+    for element_id, entry in previous.items():
+        previous_sheets.setdefault(entry["sheet"], set()).add(element_id)
+    manifest = {}
+    stats = {"elements": 0, "exported": 0, "valuesets": 0, "models": 0}
+
+    def finish(model):
+        # A sheet that lost an element must be rewritten even if nothing
+        # left on it changed.
+        if previous_sheets.get(model["sheet"], set()) - model["ids"]:
+            model["changed"] = True
+        close_model(model, model["changed"])
+        stats["models"] += model["changed"]
+
+    csv_path = os.path.join(out_dir, CHANGED_CSV_FILE if changed_only else CSV_FILE)
+    with open(csv_path, "w", newline="", encoding="utf-8") as csv_fh:
+        writer = None
+        model = None
+        for element in iter_elements(iter_rows(source)):
+            sheet, row = element["sheet"], element["row"]
+            if model is None or model["sheet"] != sheet:
+                if model is not None:
+                    finish(model)
+                model = open_model(out_dir, sheet)
+
+            if writer is None:
+                fields = ["Sheet", "Parent Element ID"] + list(row)
+                writer = csv.DictWriter(csv_fh, fieldnames=fields, extrasaction="ignore")
+                writer.writeheader()
+
+            element_id = row["Data Element ID"]
+            entry = {"sheet": sheet, "hash": element_hash(element),
+                     "valueset": bool(element["options"])}
+            manifest[element_id] = entry
+            stats["elements"] += 1
+            write_model_element(model, element)
+
+            if changed_only and previous.get(element_id) == entry:
+                continue
+            model["changed"] = True
+            stats["exported"] += 1
+            writer.writerow({"Sheet": sheet, "Parent Element ID": "", **row})
+            for option in element["options"]:
+                writer.writerow({"Sheet": sheet, "Parent Element ID": row["Data Element ID"],
+                                 **option})
+            if element["options"]:
+                write_valueset(out_dir, element)
+                stats["valuesets"] += 1
+            elif previous.get(element_id, {}).get("valueset"):
+                remove_file(valueset_path(out_dir, element_id))
+
+        if model is not None:
+            finish(model)
+
+    removed = [k for k in previous if k not in manifest]
+    for element_id in removed:
+        if previous[element_id]["valueset"]:
+            remove_file(valueset_path(out_dir, element_id))
+    exported_sheets = {e["sheet"] for e in manifest.values()}
+    for sheet in previous_sheets:
+        if sheet not in exported_sheets:
+            remove_file(model_path(out_dir, sheet))
+
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    stats["removed"] = removed
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default=ANNEX_A_FILE, help="Annex A workbook")
+    parser.add_argument("--out", default=EXPORT_DIR, help="Output directory")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="Only re-export elements changed since the last run")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"ERROR: {args.source} not found.", file=sys.stderr)
+        sys.exit(1)
+
+    stats = export(args.source, args.out, args.changed_only)
+    print(f"Read {stats['elements']} data elements from {args.source}")
+    print(f"Exported {stats['exported']} elements, {stats['valuesets']} ValueSets, "
+          f"{stats['models']} logical models to {args.out}/")
+    if stats["removed"]:
+        print(f"Removed since last run: {', '.join(stats['removed'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+DAK Workload Generator - Writes synthetic inputs for scale testing.
+Produces a recommendations workbook with the same columns as
+"HIV recs to test_v1.xlsx" (mapped MAPPING prefixes, unmapped IDs, duplicates
+and long texts) and scaled-up copies of the four DAK workbooks whose data rows
+are repeated with renumbered IDs, keeping every sheet's header layout.
+Output is seeded, so a given --seed/--rows/--dak-scale always produces the
+same files. Workbooks are read and written in openpyxl streaming mode.
+"""
+
+import os
+import re
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta
+
+import openpyxl
+
+from create_dak_issues import DAK_FILE_ROLES, MAPPING, UPDATES_FILE
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+WORKLOAD_DIR = "dak-workload"
+
+RECOMMENDATION_COLUMNS = [
+    "Date", "Year", "Recommendation Type", "Topic Area", "Recommendation Number",
+    "Recommendation Text", "Rationale for change", "Previous recommendations",
+]
+
+# Share of generated recommendation rows of each kind; the rest are mapped.
+UNMAPPED_SHARE = 0.15
+DUPLICATE_SHARE = 0.10
+LONG_TEXT_SHARE = 0.05
+LONG_TEXT_REPEATS = (10, 40)
+# Recommendation dates fall within a year of the real fixture's (2025-07-04).
+FIRST_DATE = datetime(2025, 7, 4)
+
+TOPICS = {
+    "TST": "Testing",
+    "PRV": "Prevention ",
+    "VER": "Vertical Transmission",
+    "TRT": "Treatment",
+    "TBH": "TB/HIV",
+    "SRV": "Service delivery",
+}
+UNMAPPED_AREAS = ["DIA", "KEY", "ADH", "LAB", "NUT", "STI"]
+
+FALLBACK_TEXT = (
+    "Health workers should offer the recommended service to people living with HIV "
+    "at each clinical contact, in line with national guidance."
+)
+FALLBACK_RATIONALE = "New evidence supported development of a new recommendation."
+
+# Sheets copied verbatim rather than scaled (front matter and aggregate views).
+UNSCALED_SHEETS = {"COVER", "README", "SEARCH", "all", "Example Decision Tables", "REFERENCES"}
+# Schedule sheets (HIV.S.*) carry an ID row, a heading row and a row describing
+# each column above their service rows.
+SCHEDULE_HEADER_ROWS = 4
+
+# Numbered IDs renumbered in each copy of a data row, so scaled workbooks
+# still have unique element, rule, indicator and requirement IDs.
+SCALED_ID_RE = re.compile(
+    r"(HIV\.[A-Za-z-]+\.DE|HIV\.[A-Z]\d+(?:\.\d+)?\.DT\.|HIV\.IND\.|HIV\.N?FXNREQ\.)(\d+)"
+)
+ID_STRIDE = 10000
+RULE_ID_RE = re.compile(r"\.DT\.\d+$")
+
+
+# ---------------------------------------------------------------------------
+# Recommendations
+# ---------------------------------------------------------------------------
+
+def template_recommendations(path: str):
+    """Real recommendation rows to draw texts from, if the fixture is present."""
+    if not os.path.exists(path):
+        return []
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        rows = wb["Sheet1"].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows)]
+        return [dict(zip(header, r)) for r in rows if any(v is not None for v in r)]
+    finally:
+        wb.close()
+
+
+def recommendation_number(rng: random.Random, mapped: bool, serial: int):
+    if mapped:
+        key = rng.choice(list(MAPPING))
+        # The real fixture sometimes has a non-breaking space before the suffix.
+        sep = "\xa0" if rng.random() < 0.1 else ""
+        return key, f"{key}{sep}.{serial:02d}"
+    area = rng.choice(UNMAPPED_AREAS)
+    key = f"HIV.{area}.{rng.randint(2019, 2026)}.{rng.randint(1, 999):03d}"
+    return key, f"{key}.{serial:02d}"
+
+
+def iter_recommendations(n: int, rng: random.Random, templates: list = None):
+    """Yield n rows in RECOMMENDATION_COLUMNS order."""
+    templates = templates or []
+    issued = []
+    for serial in range(1, n + 1):
+        roll = rng.random()
+        if issued and roll < DUPLICATE_SHARE:
+            row = list(rng.choice(issued))
+            issued.append(row)
+            yield row
+            continue
+
+        key, number = recommendation_number(
+            rng, roll >= DUPLICATE_SHARE + UNMAPPED_SHARE, serial)
+        template = rng.choice(templates) if templates else {}
+        text = str(template.get("Recommendation Text") or FALLBACK_TEXT)
+        rationale = str(template.get("Rationale for change") or FALLBACK_RATIONALE)
+        if rng.random() < LONG_TEXT_SHARE:
+            text = " ".join([text] * rng.randint(*LONG_TEXT_REPEATS))
+        rec_type = rng.choice(["New", "New", "Existing", "Updated"])
+        area = key.split(".")[1]
+        row = [
+            FIRST_DATE + timedelta(days=rng.randint(0, 365)),
+            int(key.split(".")[2]),
+            rec_type,
+            TOPICS.get(area, area.title()),
+            number,
+            text,
+            rationale,
+            template.get("Previous recommendations") if rec_type == "Existing" else None,
+        ]
+        issued.append(row)
+        yield row
+
+
+def write_recommendations(path: str, n: int, rng: random.Random, templates: list = None):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(RECOMMENDATION_COLUMNS)
+    for row in iter_recommendations(n, rng, templates):
+        ws.append(row)
+    wb.save(path)
+
+
+# ---------------------------------------------------------------------------
+# DAK workbooks
+# ---------------------------------------------------------------------------
+
+def header_row_count(sheet: str, rows: list):
+    """Rows at the top of a sheet that are kept once; None copies the sheet verbatim."""
+    if sheet in UNSCALED_SHEETS:
+        return None
+    if sheet.startswith("HIV.S."):
+        return SCHEDULE_HEADER_ROWS
+    if ".DT" in sheet:
+        for i, row in enumerate(rows):
+            if any(isinstance(v, str) and RULE_ID_RE.search(v.strip()) for v in row[:3]):
+                return i
+        return None
+    return 1
+
+
+def renumber(value, copy: int):
+    if copy == 0 or not isinstance(value, str):
+        return value
+
+    def shift(m):
+        number = str(int(m.group(2)) + copy * ID_STRIDE)
+        return m.group(1) + number.zfill(len(m.group(2)))
+
+    return SCALED_ID_RE.sub(shift, value)
+
+
+def scale_workbook(src: str, dst: str, scale: int):
+    """Write dst with every data sheet of src repeated scale times."""
+    src_wb = openpyxl.load_workbook(src, read_only=True)
+    dst_wb = openpyxl.Workbook(write_only=True)
+    try:
+        for sheet in src_wb.sheetnames:
+            ws = dst_wb.create_sheet(sheet)
+            rows = list(src_wb[sheet].iter_rows(values_only=True))
+            header = header_row_count(sheet, rows)
+            if header is None:
+                for row in rows:
+                    ws.append(row)
+                continue
+            for row in rows[:header]:
+                ws.append(row)
+            for copy in range(scale):
+                for row in rows[header:]:
+                    ws.append([renumber(v, copy) for v in row])
+        dst_wb.save(dst)
+    finally:
+        src_wb.close()
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def generate(out_dir: str, rows: int, dak_scale: int, seed: int = 0, base_dir: str = "."):
+    """Write a full workload into out_dir; returns the paths written."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    written = []
+
+    recs = os.path.join(out_dir, UPDATES_FILE)
+    write_recommendations(recs, rows, rng, template_recommendations(os.path.join(base_dir, UPDATES_FILE)))
+    written.append(recs)
+
+    if dak_scale:
+        for f in DAK_FILE_ROLES:
+            src = os.path.join(base_dir, f)
+            if not os.path.exists(src):
+                print(f"  WARNING: {f} not found; skipping")
+                continue
+            dst = os.path.join(out_dir, f)
+            scale_workbook(src, dst, dak_scale)
+            written.append(dst)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Recommendation rows to generate")
+    parser.add_argument("--dak-scale", type=int, default=1,
+                        help="Times each DAK data sheet is repeated (0 skips the DAK workbooks)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=WORKLOAD_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    if args.rows < 1 or args.dak_scale < 0:
+        print("ERROR: --rows must be positive and --dak-scale non-negative.", file=sys.stderr)
+        sys.exit(1)
+
+    for path in generate(args.out, args.rows, args.dak_scale, args.seed):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
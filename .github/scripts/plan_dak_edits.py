@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+DAK Edit Planner - Coalesces MAPPING changes into one edit plan per workbook.
+Groups every pending change across all recommendations by (file, sheet),
+flags overlapping or conflicting edits to the same element, decision ID or
+schedule ID, and orders the edits so each DAK workbook is opened, modified
+and saved exactly once.
+"""
+
+import os
+import re
+import sys
+import json
+
+import openpyxl
+import pandas as pd
+
+from create_dak_issues import DAK_FILE_ROLES, MAPPING, UPDATES_FILE, get_mapping_key
+from dak_ids import DAK_ID_RE, ID_END
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+PLAN_FILE = "dak-edit-plan.json"
+
+# Edits within a sheet are applied in this order: removals first so nothing
+# is edited and then deleted, additions before modifications so a change that
+# touches an element added by another recommendation finds it in place, and
+# verifications last so they see the final state of the sheet.
+OPERATION_ORDER = ["remove", "add", "modify", "verify"]
+
+OPERATION_VERBS = {
+    "remove": "remove", "delete": "remove", "retire": "remove",
+    "add": "add", "create": "add",
+    "modify": "modify", "update": "modify", "extend": "modify", "refine": "modify",
+    "link": "modify", "reinforce": "modify", "replace": "modify", "adjust": "modify",
+    "verify": "verify", "confirm": "verify", "ensure": "verify",
+}
+
+QUOTED_RE = re.compile(r"'([^']+)'")
+# The quoted label an operation acts on, e.g. "Add new data element 'HIV test type'".
+SUBJECT_RE = re.compile(r"^(?:[\w/-]+\s+){0,3}'([^']+)'")
+VERB_RE = re.compile(r"\b(" + "|".join(OPERATION_VERBS) + r")\b", re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def sheet_id(sheet: str):
+    """Leading decision/schedule ID of a sheet name (e.g. 'HIV.S.1'), if any."""
+    token = sheet.strip().split(" ")[0]
+    return token if DAK_ID_RE.fullmatch(token) else None
+
+
+def mentions(text: str, token: str):
+    return re.search(r"(?<![\w.])" + re.escape(token) + ID_END, text) is not None
+
+
+def split_change(change: str):
+    prefix, sep, body = change.partition(":")
+    if not sep:
+        return "", change.strip()
+    return prefix.strip(), body.strip()
+
+
+def resolve_sheets(prefix: str, sheets: list):
+    """Sheets of a MAPPING entry that a change prefix names."""
+    if not prefix:
+        return []
+    named = [s for s in sheets if mentions(prefix, s.strip())]
+    if named:
+        return named
+    return [s for s in sheets if sheet_id(s) and mentions(prefix, sheet_id(s))]
+
+
+def classify_operation(body: str):
+    m = VERB_RE.search(body)
+    return OPERATION_VERBS[m.group(1).lower()] if m else "modify"
+
+
+def change_subject(body: str):
+    m = VERB_RE.search(body)
+    if not m:
+        return None
+    s = SUBJECT_RE.match(body[m.end():].lstrip())
+    return f"'{s.group(1).strip()}'" if s else None
+
+
+def change_targets(change: str, sheet: str):
+    own = sheet_id(sheet)
+    ids = [i for i in DAK_ID_RE.findall(change) if i != own]
+    labels = [f"'{q.strip()}'" for q in QUOTED_RE.findall(change)]
+    return list(dict.fromkeys(ids + labels))
+
+
+def collect_edits(keys: list):
+    """Flatten MAPPING entries for the given keys into one edit per (change, sheet)."""
+    edits = []
+    for key in keys:
+        for item in MAPPING.get(key, {}).get("affected", []):
+            previous = item["sheets"][:1]
+            for index, change in enumerate(item["changes"]):
+                prefix, body = split_change(change)
+                sheets = resolve_sheets(prefix, item["sheets"])
+                if not sheets:
+                    # Unprefixed follow-ups ("Link all new elements ...") apply
+                    # to whatever the preceding change targeted.
+                    sheets, body = previous, change.strip()
+                previous = sheets
+                for sheet in sheets:
+                    edits.append({
+                        "recommendation": key,
+                        "file": item["file"],
+                        "sheet": sheet,
+                        "operation": classify_operation(body),
+                        "subject": change_subject(body),
+                        "targets": change_targets(change, sheet),
+                        "change": change,
+                        "index": index,
+                    })
+    return edits
+
+
+def find_overlaps(edits: list):
+    """Return (overlaps, conflicts) for targets touched by more than one recommendation."""
+    touched = {}
+    for edit in edits:
+        for target in edit["targets"]:
+            touched.setdefault((edit["sheet"], target), []).append(edit)
+
+    overlaps, conflicts = [], []
+    for (sheet, target), group in touched.items():
+        recs = list(dict.fromkeys(e["recommendation"] for e in group))
+        if len(recs) < 2:
+            continue
+        ops = [e["operation"] for e in group]
+        entry = {
+            "sheet": sheet,
+            "target": target,
+            "recommendations": recs,
+            "operations": sorted(set(ops), key=OPERATION_ORDER.index),
+        }
+        adders = {e["recommendation"] for e in group
+                  if e["operation"] == "add" and e["subject"] == target}
+        if "remove" in ops and len(set(ops)) > 1:
+            conflicts.append({**entry, "reason": "removed by one recommendation and edited by another"})
+        elif len(adders) > 1:
+            conflicts.append({**entry, "reason": "added by more than one recommendation"})
+        else:
+            overlaps.append(entry)
+    return overlaps, conflicts
+
+
+def workbook_sheet_order(path: str):
+    if not os.path.exists(path):
+        return []
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return wb.sheetnames
+    finally:
+        wb.close()
+
+
+def build_plan(keys: list, sheet_order: dict = None):
+    """Group edits by workbook and sheet and order them for a single pass per workbook."""
+    sheet_order = sheet_order or {}
+    edits = collect_edits(keys)
+    rec_rank = {k: i for i, k in enumerate(keys)}
+    files = list(DAK_FILE_ROLES) + [f for f in dict.fromkeys(e["file"] for e in edits)
+                                    if f not in DAK_FILE_ROLES]
+    plan = []
+    for f in files:
+        file_edits = [e for e in edits if e["file"] == f]
+        if not file_edits:
+            continue
+        order = sheet_order.get(f, [])
+        first_seen = list(dict.fromkeys(e["sheet"] for e in file_edits))
+
+        def sheet_rank(sheet):
+            if sheet in order:
+                return (0, order.index(sheet))
+            return (1, first_seen.index(sheet))
+
+        file_edits.sort(key=lambda e: (
+            sheet_rank(e["sheet"]),
+            OPERATION_ORDER.index(e["operation"]),
+            rec_rank[e["recommendation"]],
+            e["index"],
+        ))
+        overlaps, conflicts = find_overlaps(file_edits)
+        plan.append({
+            "file": f,
+            "role": DAK_FILE_ROLES.get(f, f),
+            "sheets": list(dict.fromkeys(e["sheet"] for e in file_edits)),
+            "edits": [{k: v for k, v in e.items() if k not in ("file", "index")}
+                      for e in file_edits],
+            "overlaps": overlaps,
+            "conflicts": conflicts,
+        })
+    return plan
+
+
+def apply_plan(plan: list, apply_edit, base_dir: str = "."):
+    """
+    Run one read-modify-write pass per workbook: load it once, call
+    apply_edit(worksheet, edit) for every planned edit in order, save once.
+    Refuses a plan with conflicts. Note that openpyxl drops shapes and
+    drawings and may lose other formatting on save, so only use this on
+    workbooks where that is acceptable (e.g. generated copies).
+    """
+    conflicted = [w["file"] for w in plan if w["conflicts"]]
+    if conflicted:
+        raise ValueError(f"Plan has unresolved conflicts in {', '.join(conflicted)}")
+    for workbook in plan:
+        path = os.path.join(base_dir, workbook["file"])
+        wb = openpyxl.load_workbook(path)
+        for edit in workbook["edits"]:
+            apply_edit(wb[edit["sheet"]], edit)
+        wb.save(path)
+
+
+def format_plan(plan: list):
+    lines = ["# DAK Edit Plan\n"]
+    for workbook in plan:
+        lines += [f"## `{workbook['file']}` — {workbook['role']}", ""]
+        current = None
+        for j, edit in enumerate(workbook["edits"], 1):
+            if edit["sheet"] != current:
+                current = edit["sheet"]
+                lines += ["", f"### {current}"]
+            lines.append(f"{j}. [{edit['operation']}] `{edit['recommendation']}` — {edit['change']}")
+        lines.append("")
+        if workbook["conflicts"]:
+            lines.append("**Conflicts:**")
+            for c in workbook["conflicts"]:
+                lines.append(f"- {c['sheet']} / {c['target']}: {c['reason']} "
+                             f"({', '.join(c['recommendations'])})")
+            lines.append("")
+        if workbook["overlaps"]:
+            lines.append("**Overlapping edits:**")
+            for o in workbook["overlaps"]:
+                lines.append(f"- {o['sheet']} / {o['target']}: "
+                             f"{', '.join(o['recommendations'])} ({', '.join(o['operations'])})")
+            lines.append("")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    df = pd.read_excel(UPDATES_FILE, sheet_name="Sheet1", dtype=str)
+    df = df.dropna(subset=["Recommendation Number"])
+
+    keys = []
+    for rec_num in df["Recommendation Number"]:
+        key = get_mapping_key(str(rec_num))
+        if not key:
+            print(f"  WARNING: No mapping found for {str(rec_num).strip()}")
+        elif key not in keys:
+            keys.append(key)
+
+    sheet_order = {f: workbook_sheet_order(f) for f in DAK_FILE_ROLES}
+    plan = build_plan(keys, sheet_order)
+    print(format_plan(plan))
+
+    with open(PLAN_FILE, "w") as fh:
+        json.dump(plan, fh, indent=2)
+    print(f"Plan saved to {PLAN_FILE}")
+
+    if any(w["conflicts"] for w in plan):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()